@@ -1,45 +1,63 @@
 # Instalar bibliotecas (caso necessário)
-# pip install pulp kagglehub pandas
+# pip install pulp kagglehub pandas numpy highspy pyarrow
 
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import kagglehub
 import pulp
 
+# Configuração do HiGHS (em processo) compartilhada por todos os modelos; o PuLP
+# ainda cria uma instância nova do HiGHS a cada solve(). Presolve sempre
+# ligado; simplex dual e escalonamento já são o padrão do HiGHS.
+solver = pulp.HiGHS(msg=False, presolve="on")
+
 # 1) Baixar dataset (custos de seguro de saúde)
-path = kagglehub.dataset_download(
-    "mosapabdelghany/medical-insurance-cost-dataset"
-)
-df = pd.read_csv(path + "/insurance.csv")
+#    O download só acontece na primeira execução; depois o DataFrame
+#    é lido do cache em Parquet.
+cache_dataset = Path(__file__).with_name("insurance.parquet")
+if cache_dataset.exists():
+    df = pd.read_parquet(cache_dataset)
+else:
+    path = kagglehub.dataset_download(
+        "mosapabdelghany/medical-insurance-cost-dataset"
+    )
+    df = pd.read_csv(path + "/insurance.csv", engine="pyarrow")
+    df.to_parquet(cache_dataset)
+
+# Colunas usadas pelas consultas, extraídas uma única vez como arrays NumPy
+idade = df["age"].to_numpy()
+bmi = df["bmi"].to_numpy()
+custos = df["charges"].to_numpy(dtype=np.float64)  # custo real de cada cliente
+fumante = df["smoker"].to_numpy() == "yes"
 
 # 2) Suponha que queremos escolher quais clientes aceitar
 #    para maximizar receita, respeitando um limite de custo médio
 
 # Receita hipotética = valor do seguro
 df["receita"] = 5000  # simplificação
-df["custo"] = df["charges"]  # coluna real do dataset
-
-# 3) Definir modelo de otimização
-clientes = list(df.index)
-x = pulp.LpVariable.dicts("x", clientes, lowBound=0, upBound=1, cat="Binary")
-
-prob = pulp.LpProblem("SelecaoSeguros", pulp.LpMaximize)
 
-# Objetivo: maximizar receita total
-prob += pulp.lpSum(df.loc[i, "receita"] * x[i] for i in clientes)
+# 3) Seleção ótima (forma fechada, sem chamar o solver)
+# Como a receita é a mesma para todos os clientes, maximizar a receita equivale
+# a maximizar o número de clientes aceitos. A restrição de custo médio ≤ 15.000
+# equivale a sum(15000 - custo_i) >= 0 sobre os selecionados, então basta aceitar
+# os clientes em ordem decrescente de folga enquanto a soma acumulada for >= 0.
+receitas = df["receita"].to_numpy()
 
-# Restrição: custo médio ≤ 15.000
-prob += pulp.lpSum(df.loc[i, "custo"] * x[i] for i in clientes) <= 15000 * pulp.lpSum(x[i] for i in clientes)
+folga = 15000.0 - custos
+ordem = np.argsort(-folga, kind="stable")
+acumulado = np.cumsum(folga[ordem])
+selecionados = ordem[:np.count_nonzero(acumulado >= 0)]
 
-# 4) Resolver
-prob.solve()
-
-# 5) Mostrar resultado
-selecionados = [i for i in clientes if x[i].value() == 1]
+# 4) Mostrar resultado
+receita_total = receitas[selecionados].sum()
 print("=== CONSULTA 1: SELEÇÃO DE CLIENTES PARA MAXIMIZAR RECEITA ===")
 print(f"Clientes escolhidos: {len(selecionados)}")
-print(f"Receita total: ${pulp.value(prob.objective):,.2f}")
-if selecionados:
-    custo_medio_selecionados = df.loc[selecionados, "custo"].mean()
+print(f"Receita total: ${receita_total:,.2f}")
+if len(selecionados):
+    custo_medio_selecionados = custos[selecionados].mean()
     print(f"Custo médio dos selecionados: ${custo_medio_selecionados:,.2f}")
 
 print("\n" + "="*80 + "\n")
@@ -49,7 +67,9 @@ print("\n" + "="*80 + "\n")
 # ===================================================================
 
 # Criar variável de região simulada baseada no IMC
-df["regiao"] = df["bmi"].apply(lambda x: "Norte" if x < 25 else "Sul" if x < 30 else "Centro")
+nomes_regioes = np.array(["Norte", "Sul", "Centro"])
+codigos_regiao = np.where(bmi < 25, 0, np.where(bmi < 30, 1, 2))
+df["regiao"] = nomes_regioes[codigos_regiao]
 
 # Modelo para distribuir clientes por região, minimizando risco total
 prob2 = pulp.LpProblem("PortfolioRegiao", pulp.LpMinimize)
@@ -59,25 +79,29 @@ regioes = df["regiao"].unique()
 y = pulp.LpVariable.dicts("clientes_regiao", regioes, lowBound=0, cat="Integer")
 
 # Objetivo: minimizar custo total ponderado por região
-custos_por_regiao = df.groupby("regiao")["custo"].mean().to_dict()
-prob2 += pulp.lpSum(custos_por_regiao[r] * y[r] for r in regioes)
+custo_medio_regiao = (np.bincount(codigos_regiao, weights=custos, minlength=3) /
+                      np.bincount(codigos_regiao, minlength=3))
+custos_por_regiao = dict(zip(nomes_regioes.tolist(), custo_medio_regiao.tolist()))
+prob2 += pulp.LpAffineExpression([(y[r], custos_por_regiao[r]) for r in regioes])
+
+# Restrições (a expressão do total é construída uma vez e reutilizada):
+total_clientes = pulp.LpAffineExpression([(y[r], 1) for r in regioes])
 
-# Restrições:
 # - Pelo menos 50 clientes no total
-prob2 += pulp.lpSum(y[r] for r in regioes) >= 50
+prob2 += total_clientes >= 50
 
 # - Máximo 30% de clientes de qualquer região
-total_clientes = pulp.lpSum(y[r] for r in regioes)
 for r in regioes:
-    prob2 += y[r] <= 0.3 * total_clientes
+    prob2 += y[r] - 0.3 * total_clientes <= 0
 
 # - Pelo menos 10 clientes por região
 for r in regioes:
     prob2 += y[r] >= 10
 
-prob2.solve()
+prob2.solve(solver)
 
 print("=== CONSULTA 2: OTIMIZAÇÃO DE PORTFÓLIO POR REGIÃO ===")
+print(f"Status do modelo: {pulp.LpStatus[prob2.status]}")
 for r in regioes:
     print(f"Clientes da região {r}: {int(y[r].value())}")
 print(f"Custo total estimado: ${pulp.value(prob2.objective):,.2f}")
@@ -89,46 +113,36 @@ print("\n" + "="*80 + "\n")
 # ===================================================================
 
 # Simular demanda por tipo de serviço baseada em características dos clientes
-df["demanda_emergencia"] = ((df["age"] > 50) | (df["smoker"] == "yes")).astype(int)
-df["demanda_cirurgia"] = ((df["bmi"] > 35) | (df["age"] > 60)).astype(int)
-df["demanda_consulta"] = 1  # todos precisam de consultas
-
-# Modelo para determinar capacidade ideal de cada tipo de serviço
-prob3 = pulp.LpProblem("CapacidadeHospitalar", pulp.LpMinimize)
-
-# Variáveis: capacidade de cada serviço
-cap_emergencia = pulp.LpVariable("cap_emergencia", lowBound=0, cat="Integer")
-cap_cirurgia = pulp.LpVariable("cap_cirurgia", lowBound=0, cat="Integer")
-cap_consulta = pulp.LpVariable("cap_consulta", lowBound=0, cat="Integer")
+demanda_emergencia = ((idade > 50) | fumante).astype(int)
+demanda_cirurgia = ((bmi > 35) | (idade > 60)).astype(int)
+demanda_consulta = np.ones(len(df), dtype=int)  # todos precisam de consultas
 
 # Custos fixos por unidade de capacidade
 custo_emergencia = 10000
 custo_cirurgia = 15000
 custo_consulta = 2000
-
-# Objetivo: minimizar custo total de capacidade
-prob3 += (cap_emergencia * custo_emergencia + 
-          cap_cirurgia * custo_cirurgia + 
-          cap_consulta * custo_consulta)
-
-# Restrições: atender toda a demanda
-prob3 += cap_emergencia >= df["demanda_emergencia"].sum()
-prob3 += cap_cirurgia >= df["demanda_cirurgia"].sum()
-prob3 += cap_consulta >= df["demanda_consulta"].sum()
-
-# Restrição de recursos: total não pode exceder um orçamento
-prob3 += (cap_emergencia * custo_emergencia + 
-          cap_cirurgia * custo_cirurgia + 
-          cap_consulta * custo_consulta) <= 2000000
-
-prob3.solve()
+orcamento_capacidade = 2000000
+
+# Solução em forma fechada: cada capacidade só é limitada inferiormente pela
+# sua demanda e o objetivo (minimizar custo) é separável, então o ótimo é fixar
+# cada capacidade na própria demanda. O orçamento apenas decide a viabilidade.
+cap_emergencia = int(demanda_emergencia.sum())
+cap_cirurgia = int(demanda_cirurgia.sum())
+cap_consulta = int(demanda_consulta.sum())
+custo_capacidade = (cap_emergencia * custo_emergencia +
+                    cap_cirurgia * custo_cirurgia +
+                    cap_consulta * custo_consulta)
+status3 = "Optimal" if custo_capacidade <= orcamento_capacidade else "Infeasible"
 
 print("=== CONSULTA 3: PLANEJAMENTO DE CAPACIDADE HOSPITALAR ===")
+print(f"Status do modelo: {status3}")
 print(f"Capacidade recomendada:")
-print(f"  - Emergência: {int(cap_emergencia.value())} unidades")
-print(f"  - Cirurgia: {int(cap_cirurgia.value())} unidades") 
-print(f"  - Consulta: {int(cap_consulta.value())} unidades")
-print(f"Custo total de capacidade: ${pulp.value(prob3.objective):,.2f}")
+print(f"  - Emergência: {cap_emergencia} unidades")
+print(f"  - Cirurgia: {cap_cirurgia} unidades")
+print(f"  - Consulta: {cap_consulta} unidades")
+print(f"Custo total de capacidade: ${custo_capacidade:,.2f}")
+if status3 == "Infeasible":
+    print(f"Orçamento de ${orcamento_capacidade:,.2f} insuficiente para atender a demanda")
 
 print("\n" + "="*80 + "\n")
 
@@ -137,7 +151,10 @@ print("\n" + "="*80 + "\n")
 # ===================================================================
 
 # Criar faixas etárias para análise
-df["faixa_etaria"] = pd.cut(df["age"], bins=[0, 30, 50, 100], labels=["Jovem", "Adulto", "Senior"])
+# (0, 30] -> Jovem, (30, 50] -> Adulto, (50, 100] -> Senior
+nomes_faixas = np.array(["Jovem", "Adulto", "Senior"])
+codigos_faixa = np.searchsorted([30, 50], idade)
+df["faixa_etaria"] = nomes_faixas[codigos_faixa]
 
 # Modelo para alocar recursos por faixa etária
 prob4 = pulp.LpProblem("AlocacaoFaixaEtaria", pulp.LpMaximize)
@@ -149,29 +166,35 @@ clientes_faixa = pulp.LpVariable.dicts("clientes", faixas, lowBound=0, cat="Inte
 # Receita média por faixa etária (simulada)
 receita_faixa = {"Jovem": 4000, "Adulto": 5000, "Senior": 6000}
 
-# Custo médio por faixa etária
-custo_faixa = df.groupby("faixa_etaria", observed=True)["charges"].mean().to_dict()
+# Clientes disponíveis e custo médio por faixa etária (uma passada em cada bincount)
+contagem_faixa = np.bincount(codigos_faixa, minlength=3)
+soma_custo_faixa = np.bincount(codigos_faixa, weights=custos, minlength=3)
+disponivel_faixa = dict(zip(nomes_faixas.tolist(), contagem_faixa.tolist()))
+custo_faixa = dict(zip(nomes_faixas.tolist(), (soma_custo_faixa / contagem_faixa).tolist()))
 
-# Objetivo: maximizar lucro total
-prob4 += pulp.lpSum((receita_faixa[f] - custo_faixa[f]) * clientes_faixa[f] for f in faixas)
+# Objetivo: maximizar lucro total, em milhares de reais, para manter os
+# coeficientes do objetivo na mesma ordem de grandeza das restrições
+escala_lucro = 1000
+prob4 += pulp.LpAffineExpression([(clientes_faixa[f], (receita_faixa[f] - custo_faixa[f]) / escala_lucro)
+                                  for f in faixas])
 
 # Restrições:
 # - Não exceder o número disponível de clientes por faixa
-disponivel_faixa = df["faixa_etaria"].value_counts().to_dict()
 for f in faixas:
     prob4 += clientes_faixa[f] <= disponivel_faixa[f]
 
 # - Total de clientes deve ser pelo menos 100
-prob4 += pulp.lpSum(clientes_faixa[f] for f in faixas) >= 100
+total_clientes = pulp.LpAffineExpression([(clientes_faixa[f], 1) for f in faixas])
+prob4 += total_clientes >= 100
 
 # - Pelo menos 20% de cada faixa etária
-total_clientes = pulp.lpSum(clientes_faixa[f] for f in faixas)
 for f in faixas:
-    prob4 += clientes_faixa[f] >= 0.2 * total_clientes
+    prob4 += clientes_faixa[f] - 0.2 * total_clientes >= 0
 
-prob4.solve()
+prob4.solve(solver)
 
 print("=== CONSULTA 4: ANÁLISE DE ALOCAÇÃO POR FAIXA ETÁRIA ===")
+print(f"Status do modelo: {pulp.LpStatus[prob4.status]}")
 for f in faixas:
     if clientes_faixa[f].value() is not None:
         lucro_unit = receita_faixa[f] - custo_faixa[f]
@@ -182,7 +205,7 @@ for f in faixas:
         print(f"  - Lucro unitário: ${lucro_unit:,.2f}")
 
 if pulp.value(prob4.objective) is not None:
-    print(f"Lucro total estimado: ${pulp.value(prob4.objective):,.2f}")
+    print(f"Lucro total estimado: ${pulp.value(prob4.objective) * escala_lucro:,.2f}")
 
 print("\n" + "="*80 + "\n")
 
@@ -195,41 +218,36 @@ canais = ["Digital", "TV", "Radio", "Impresso"]
 custo_por_lead = {"Digital": 50, "TV": 200, "Radio": 75, "Impresso": 100}
 conversao_rate = {"Digital": 0.15, "TV": 0.08, "Radio": 0.10, "Impresso": 0.05}
 
-# Modelo para alocar orçamento de marketing
-prob5 = pulp.LpProblem("AlocacaoMarketing", pulp.LpMaximize)
-
-# Variáveis: orçamento por canal
-orcamento = pulp.LpVariable.dicts("orcamento", canais, lowBound=0)
-
-# Objetivo: maximizar número total de novos clientes
-prob5 += pulp.lpSum((orcamento[c] / custo_por_lead[c]) * conversao_rate[c] for c in canais)
-
-# Restrições:
-# - Orçamento total limitado
-prob5 += pulp.lpSum(orcamento[c] for c in canais) <= 500000
-
-# - Mínimo de investimento por canal
-for c in canais:
-    prob5 += orcamento[c] >= 20000
-
-# - Máximo 40% do orçamento em qualquer canal
-total_orcamento = pulp.lpSum(orcamento[c] for c in canais)
-for c in canais:
-    prob5 += orcamento[c] <= 0.4 * total_orcamento
-
-prob5.solve()
+# Limites de orçamento
+orcamento_total = 500000
+orcamento_minimo = 20000  # por canal
+orcamento_maximo = 0.4 * orcamento_total  # 40% do orçamento em qualquer canal
+
+# Solução em forma fechada: o objetivo é linear e separável, com limites por
+# canal e um único orçamento total. Como todo canal tem eficiência positiva, o
+# orçamento inteiro é usado (limite de 40% = 200.000) e basta dar o mínimo a
+# todos os canais e distribuir o restante em ordem decrescente de eficiência
+# (novos clientes por real investido) até o limite de cada canal.
+eficiencia = {c: conversao_rate[c] / custo_por_lead[c] for c in canais}
+orcamento = {c: orcamento_minimo for c in canais}
+restante = orcamento_total - orcamento_minimo * len(canais)
+status5 = "Optimal" if restante >= 0 else "Infeasible"
+for c in sorted(canais, key=lambda c: -eficiencia[c]):
+    extra = max(min(orcamento_maximo - orcamento[c], restante), 0)
+    orcamento[c] += extra
+    restante -= extra
 
 print("=== CONSULTA 5: ALOCAÇÃO ÓTIMA DE RECURSOS DE MARKETING ===")
+print(f"Status do modelo: {status5}")
 total_novos_clientes = 0
 for c in canais:
-    if orcamento[c].value() is not None:
-        leads = orcamento[c].value() / custo_por_lead[c]
-        novos_clientes = leads * conversao_rate[c]
-        total_novos_clientes += novos_clientes
-        print(f"Canal {c}:")
-        print(f"  - Orçamento: ${orcamento[c].value():,.2f}")
-        print(f"  - Leads gerados: {leads:.0f}")
-        print(f"  - Novos clientes: {novos_clientes:.0f}")
+    leads = orcamento[c] / custo_por_lead[c]
+    novos_clientes = leads * conversao_rate[c]
+    total_novos_clientes += novos_clientes
+    print(f"Canal {c}:")
+    print(f"  - Orçamento: ${orcamento[c]:,.2f}")
+    print(f"  - Leads gerados: {leads:.0f}")
+    print(f"  - Novos clientes: {novos_clientes:.0f}")
 
 print(f"Total de novos clientes: {total_novos_clientes:.0f}")
 
@@ -240,76 +258,52 @@ print("\n" + "="*80 + "\n")
 # ===================================================================
 
 # Simular localização de clientes e centros de atendimento
-import random
-random.seed(42)
+rng = np.random.default_rng(42)
 
 n_centros = 5
 n_clientes_sample = 50  # usar subset para exemplo
 
 # Coordenadas simuladas
-centros = [(random.uniform(0, 100), random.uniform(0, 100)) for _ in range(n_centros)]
-clientes_coords = [(random.uniform(0, 100), random.uniform(0, 100)) for _ in range(n_clientes_sample)]
-
-# Calcular distâncias
-def distancia(p1, p2):
-    return ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)**0.5
-
-distancias = {}
-for i in range(n_clientes_sample):
-    for j in range(n_centros):
-        distancias[(i, j)] = distancia(clientes_coords[i], centros[j])
-
-# Modelo de localização-alocação
-prob6 = pulp.LpProblem("RedeAtendimento", pulp.LpMinimize)
-
-# Variáveis:
-# z[j] = 1 se centro j está aberto
-z = pulp.LpVariable.dicts("centro_aberto", range(n_centros), cat="Binary")
-# w[i,j] = 1 se cliente i é atendido pelo centro j
-w = {}
-for i in range(n_clientes_sample):
-    for j in range(n_centros):
-        w[(i, j)] = pulp.LpVariable(f"atende_{i}_{j}", cat="Binary")
-
-# Objetivo: minimizar distância total + custo fixo dos centros
-custo_fixo_centro = 10000
-prob6 += (pulp.lpSum(distancias[(i, j)] * w[(i, j)] 
-                     for i in range(n_clientes_sample) 
-                     for j in range(n_centros)) +
-          pulp.lpSum(custo_fixo_centro * z[j] for j in range(n_centros)))
-
-# Restrições:
-# - Cada cliente deve ser atendido por exatamente um centro
-for i in range(n_clientes_sample):
-    prob6 += pulp.lpSum(w[(i, j)] for j in range(n_centros)) == 1
+centros_arr = rng.uniform(0, 100, size=(n_centros, 2))
+clientes_arr = rng.uniform(0, 100, size=(n_clientes_sample, 2))
 
-# - Cliente só pode ser atendido por centro aberto
-for i in range(n_clientes_sample):
-    for j in range(n_centros):
-        prob6 += w[(i, j)] <= z[j]
+# Calcular distâncias: D[i, j] = distância euclidiana do cliente i ao centro j
+D = np.linalg.norm(clientes_arr[:, None, :] - centros_arr[None, :, :], axis=2)
 
-# - Pelo menos 2 centros devem estar abertos
-prob6 += pulp.lpSum(z[j] for j in range(n_centros)) >= 2
+# Modelo de localização-alocação resolvido por enumeração
+# Com o conjunto de centros abertos fixado, a melhor alocação é atender cada
+# cliente pelo centro aberto mais próximo, então as variáveis binárias de
+# atendimento são desnecessárias. Com 5 centros, basta avaliar os 25 conjuntos
+# de 2 a 4 centros abertos.
+custo_fixo_centro = 10000
+min_centros_abertos = 2
+max_centros_abertos = 4
 
-# - Máximo 4 centros abertos
-prob6 += pulp.lpSum(z[j] for j in range(n_centros)) <= 4
+custo_total = np.inf
+centros_abertos = []
+for k in range(min_centros_abertos, max_centros_abertos + 1):
+    for abertos in combinations(range(n_centros), k):
+        custo = custo_fixo_centro * k + D[:, list(abertos)].min(axis=1).sum()
+        if custo < custo_total:
+            custo_total = float(custo)
+            centros_abertos = list(abertos)
 
-prob6.solve()
+status6 = "Optimal" if np.isfinite(custo_total) else "Infeasible"
 
 print("=== CONSULTA 6: g ===")
-centros_abertos = [j for j in range(n_centros) if z[j].value() == 1]
+print(f"Status do modelo: {status6}")
 print(f"Centros de atendimento abertos: {centros_abertos}")
 
-for j in centros_abertos:
-    clientes_atendidos = [i for i in range(n_clientes_sample) if w[(i, j)].value() == 1]
-    print(f"Centro {j} atende {len(clientes_atendidos)} clientes")
+if status6 == "Optimal":
+    # Centro que atende cada cliente
+    atendimento = np.array(centros_abertos)[D[:, centros_abertos].argmin(axis=1)]
+
+    for j in centros_abertos:
+        print(f"Centro {j} atende {int((atendimento == j).sum())} clientes")
 
-distancia_total = sum(distancias[(i, j)] * w[(i, j)].value() 
-                     for i in range(n_clientes_sample) 
-                     for j in range(n_centros) 
-                     if w[(i, j)].value() == 1)
-print(f"Distância total: {distancia_total:.2f}")
-print(f"Custo total: ${pulp.value(prob6.objective):,.2f}")
+    distancia_total = float(D[np.arange(n_clientes_sample), atendimento].sum())
+    print(f"Distância total: {distancia_total:.2f}")
+    print(f"Custo total: ${custo_total:,.2f}")
 
 print("\n" + "="*80)
 print("ANÁLISES PRESCRITIVAS CONCLUÍDAS!")